@@ -13,6 +13,14 @@ Optional folder grouping:
   --group-by-month
     out_dir/YYYY-MM/<bucket>.md
 
+JSON parsing:
+  By default the input is streamed, so memory stays bounded by the largest
+  conversation. `ijson` is used when installed, otherwise an incremental
+  stdlib decoder.
+  --no-stream loads the whole file at once instead: with `orjson` installed this
+  is often the fastest option for medium exports, at the cost of holding the
+  entire parsed export in RAM. Without orjson it falls back to json.load.
+
 Examples:
   # daily files, grouped into month folders
   python chatgpt_json_to_period_md.py conversations.json out_md --split daily --group-by-month --tz Asia/Tokyo
@@ -24,23 +32,33 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import math
 import os
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
 
 try:
     from zoneinfo import ZoneInfo  # py3.9+
 except ImportError:
     ZoneInfo = None  # type: ignore
 
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None  # type: ignore
+
 
 # ----------------------------
 # Utilities
 # ----------------------------
 
+_WS_RE = re.compile(r"\s+")
+
 def safe_text(x: Any) -> str:
     if x is None:
         return ""
@@ -50,29 +68,78 @@ def safe_text(x: Any) -> str:
 
 def sanitize_heading(s: str) -> str:
     s = safe_text(s).strip()
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     return s if s else "Untitled"
 
+_fromtimestamp = datetime.fromtimestamp
+
 def to_dt(ts: Any, tz) -> Optional[datetime]:
     if ts is None:
         return None
     try:
-        return datetime.fromtimestamp(float(ts), tz=tz)
+        # Exports almost always store plain floats; skip the float() call then
+        t = ts if type(ts) is float or type(ts) is int else float(ts)
+        return _fromtimestamp(t, tz)
     except Exception:
         return None
 
+def format_dt(dt: datetime) -> str:
+    # Same output as dt.strftime("%Y-%m-%d %H:%M:%S %Z"), without strftime's
+    # format parsing. tzname is resolved per datetime since it changes with DST.
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} {dt.tzname() or ''}"
+    )
+
+@functools.lru_cache(maxsize=4096)
+def _format_epoch_second(sec: int, tz) -> str:
+    return format_dt(datetime.fromtimestamp(sec, tz=tz))
+
+def format_ts(ts: Any, tz) -> str:
+    """
+    Format a raw epoch timestamp with format_dt, or "" if it is unusable.
+    Results are memoized per whole second, so repeated timestamps skip
+    datetime construction and tz resolution entirely.
+    """
+    if ts is None:
+        return ""
+    try:
+        if type(ts) is int:
+            sec = ts
+        else:
+            # Match datetime.fromtimestamp's microsecond rounding before flooring
+            sec = math.floor(round(ts if type(ts) is float else float(ts), 6))
+        return _format_epoch_second(sec, tz)
+    except Exception:
+        return ""
+
+def load_tz(name: str):
+    if name.upper() == "UTC":
+        return timezone.utc
+    if ZoneInfo is None:
+        raise SystemExit("zoneinfo not available (need Python 3.9+). Use --tz UTC.")
+    try:
+        return ZoneInfo(name)
+    except Exception as e:
+        raise SystemExit(
+            f"Could not load timezone '{name}' ({e}). "
+            f"On Windows, install tzdata: python -m pip install tzdata"
+        )
+
 def ensure_dir(p: str) -> None:
     os.makedirs(p, exist_ok=True)
 
 def md_escape_fence(s: str) -> str:
     # Avoid breaking markdown code fences if message contains ```
-    return s.replace("```", "`\u200b``")
+    return s if "```" not in s else s.replace("```", "`\u200b``")
 
 def pick_best_leaf_node_id(mapping: Dict[str, Any]) -> Optional[str]:
     best_id = None
     best_time = float("-inf")
     for node_id, node in mapping.items():
-        msg = (node or {}).get("message")
+        if not node:
+            continue
+        msg = node.get("message")
         if not msg:
             continue
         ct = msg.get("create_time")
@@ -87,29 +154,61 @@ def pick_best_leaf_node_id(mapping: Dict[str, Any]) -> Optional[str]:
             best_id = node_id
     return best_id
 
+_MISSING = object()
+
 def path_from_leaf_to_root(mapping: Dict[str, Any], leaf_id: str) -> List[str]:
+    path = []
+    # An acyclic parent chain has at most len(mapping) nodes, so reaching the
+    # bound with a node still left means the (malformed) mapping has a cycle.
+    limit = len(mapping)
+    cur = leaf_id
+    # One dict lookup per step; a missing node yields the sentinel and ends the walk.
+    node = mapping.get(cur, _MISSING)
+    while node is not _MISSING and len(path) < limit:
+        path.append(cur)
+        cur = node.get("parent") if node else None
+        if not cur:
+            break
+        node = mapping.get(cur, _MISSING)
+    else:
+        if node is not _MISSING:
+            return _path_with_cycle_check(mapping, leaf_id)
+    path.reverse()
+    return path
+
+def _path_with_cycle_check(mapping: Dict[str, Any], leaf_id: str) -> List[str]:
+    # Slow path for cyclic mappings: stop at the first repeated node so each
+    # message is rendered once.
     path = []
     seen = set()
     cur = leaf_id
     while cur and cur not in seen and cur in mapping:
         seen.add(cur)
         path.append(cur)
-        parent = (mapping[cur] or {}).get("parent")
-        if parent is None:
-            break
-        cur = parent
+        cur = (mapping[cur] or {}).get("parent")
     path.reverse()
     return path
 
 def message_is_hidden(msg: Dict[str, Any]) -> bool:
-    md = msg.get("metadata") or {}
+    md = msg.get("metadata")
+    if not md:
+        return False
     return md.get("is_visually_hidden_from_conversation") is True
 
 def extract_message_text(msg: Dict[str, Any]) -> str:
-    content = msg.get("content") or {}
+    """
+    Return the message text, already stripped.
+    """
+    content = msg.get("content")
+    if not content:
+        return ""
     parts = content.get("parts")
     if isinstance(parts, list):
-        return "\n".join(safe_text(p) for p in parts).strip()
+        try:
+            # Fast path: parts are almost always plain strings
+            return "\n".join(parts).strip()
+        except TypeError:
+            return "\n".join(safe_text(p) for p in parts).strip()
     if "text" in content:
         return safe_text(content.get("text")).strip()
     return safe_text(content).strip()
@@ -135,30 +234,44 @@ def start_of_week(d: date, week_start: str) -> date:
     sun_based = (wd + 1) % 7
     return d - timedelta(days=sun_based)
 
-def bucket_key(dt: datetime, split: str, week_start: str) -> str:
-    d = dt.date()
+# Ordinals of the week starts containing 1970-01-01; biweekly periods are
+# anchored here, and any week start is congruent to it modulo 7.
+REF_ORDINAL = {
+    "mon": start_of_week(date(1970, 1, 1), "mon").toordinal(),
+    "sun": start_of_week(date(1970, 1, 1), "sun").toordinal(),
+}
 
-    if split == "daily":
-        return d.strftime("%Y-%m-%d")
+def _range_key(s_ord: int, e_ord: int) -> str:
+    return f"{date.fromordinal(s_ord).isoformat()}_to_{date.fromordinal(e_ord).isoformat()}"
 
-    if split == "monthly":
-        return d.strftime("%Y-%m")
+def make_bucket_fn(split: str, week_start: str) -> Callable[[datetime], str]:
+    """
+    Return a function mapping a datetime to its bucket key.
 
-    if split == "weekly":
-        s = start_of_week(d, week_start)
-        e = s + timedelta(days=6)
-        return f"{s.strftime('%Y-%m-%d')}_to_{e.strftime('%Y-%m-%d')}"
+    The split/week_start dispatch happens once here rather than per call,
+    and keys are memoized per day ordinal.
+    """
+    ref = REF_ORDINAL[week_start]
 
-    if split == "biweekly":
-        # Anchor biweekly periods to a fixed reference aligned to week_start.
-        ref = start_of_week(date(1970, 1, 1), week_start)
-        days = (d - ref).days
-        period_index = days // 14
-        s = ref + timedelta(days=period_index * 14)
-        e = s + timedelta(days=13)
-        return f"{s.strftime('%Y-%m-%d')}_to_{e.strftime('%Y-%m-%d')}"
+    if split == "daily":
+        def key_for_day(o: int) -> str:
+            return date.fromordinal(o).isoformat()
+    elif split == "monthly":
+        def key_for_day(o: int) -> str:
+            return date.fromordinal(o).isoformat()[:7]
+    elif split == "weekly":
+        def key_for_day(o: int) -> str:
+            s_ord = o - (o - ref) % 7
+            return _range_key(s_ord, s_ord + 6)
+    elif split == "biweekly":
+        def key_for_day(o: int) -> str:
+            s_ord = ref + ((o - ref) // 14) * 14
+            return _range_key(s_ord, s_ord + 13)
+    else:
+        raise ValueError(f"Unknown split: {split}")
 
-    raise ValueError(f"Unknown split: {split}")
+    cached = functools.lru_cache(maxsize=8192)(key_for_day)
+    return lambda dt: cached(dt.toordinal())
 
 
 # ----------------------------
@@ -168,19 +281,20 @@ def bucket_key(dt: datetime, split: str, week_start: str) -> str:
 @dataclass
 class RenderedMessage:
     role: str
-    when: Optional[datetime]
+    stamp: str
     text: str
 
 def render_conversation_to_md(
     convo: Dict[str, Any],
     tz,
-    split: str,
-    week_start: str
-) -> Tuple[str, str, str]:
+    bucket_fn: Callable[[datetime], str]
+) -> Tuple[str, str, bytes]:
     """
-    Returns: (bucket_key, month_folder_key, markdown_chunk_for_this_conversation)
+    Returns: (bucket_key, month_folder_key, utf8_markdown_for_this_conversation)
 
     month_folder_key is "YYYY-MM" derived from conversation create_time/update_time.
+    The markdown is encoded once here so the writer can use binary files
+    without a per-write text encoding layer.
     """
     title = sanitize_heading(convo.get("title"))
 
@@ -190,14 +304,14 @@ def render_conversation_to_md(
         mon = "unknown"
         header_time = ""
     else:
-        bucket = bucket_key(ct, split=split, week_start=week_start)
+        bucket = bucket_fn(ct)
         mon = month_folder(ct)
-        header_time = ct.strftime("%Y-%m-%d %H:%M:%S %Z")
+        header_time = format_dt(ct)
 
     mapping = convo.get("mapping") or {}
     if not isinstance(mapping, dict) or not mapping:
         body = f"## {title}\n\n*(No mapping/messages found)*\n\n---\n\n"
-        return bucket, mon, body
+        return bucket, mon, body.encode("utf-8")
 
     current_node = convo.get("current_node")
     if not current_node or current_node not in mapping:
@@ -205,30 +319,30 @@ def render_conversation_to_md(
 
     if not current_node:
         body = f"## {title}\n\n*(No usable messages found)*\n\n---\n\n"
-        return bucket, mon, body
+        return bucket, mon, body.encode("utf-8")
 
     node_path = path_from_leaf_to_root(mapping, current_node)
 
     rendered: List[RenderedMessage] = []
     for node_id in node_path:
-        node = mapping.get(node_id) or {}
+        node = mapping.get(node_id)
+        if not node:
+            continue
         msg = node.get("message")
         if not isinstance(msg, dict) or not msg:
             continue
         if message_is_hidden(msg):
             continue
 
-        author = msg.get("author") or {}
-        role = safe_text(author.get("role") or "unknown").strip()
+        author = msg.get("author")
+        role = safe_text((author.get("role") if author else None) or "unknown").strip()
 
         text = extract_message_text(msg)
-        if role == "system" and text.strip() == "":
-            continue
-        if text.strip() == "":
+        if not text:
             continue
 
-        when = to_dt(msg.get("create_time"), tz)
-        rendered.append(RenderedMessage(role=role, when=when, text=text))
+        stamp = format_ts(msg.get("create_time"), tz)
+        rendered.append(RenderedMessage(role=role, stamp=stamp, text=text))
 
     lines: List[str] = []
     lines.append(f"## {title}")
@@ -238,7 +352,7 @@ def render_conversation_to_md(
 
     for m in rendered:
         who = m.role.capitalize()
-        stamp = f" ({m.when.strftime('%Y-%m-%d %H:%M:%S %Z')})" if m.when else ""
+        stamp = f" ({m.stamp})" if m.stamp else ""
         lines.append(f"### {who}{stamp}")
         lines.append("")
         lines.append(md_escape_fence(m.text))
@@ -246,36 +360,168 @@ def render_conversation_to_md(
 
     lines.append("---")
     lines.append("")
-    return bucket, mon, "\n".join(lines)
+    return bucket, mon, "\n".join(lines).encode("utf-8")
 
 
 # ----------------------------
 # Reading JSON (streaming if possible)
 # ----------------------------
 
-def iter_conversations(path: str) -> Iterator[Dict[str, Any]]:
+# Bytes handed to the ijson parser per read, amortizing per-chunk callback overhead.
+IJSON_BUF_SIZE = 256 * 1024
+# Buffer size of the binary input stream feeding ijson.
+READ_BUFFER_SIZE = 1 << 20
+# Characters read per step by the stdlib fallback reader.
+FALLBACK_READ_SIZE = 1 << 20
+
+def iter_json_array(f: TextIO, read_size: int = FALLBACK_READ_SIZE) -> Iterator[Any]:
+    """
+    Incrementally yield items of a top-level JSON array read from a text stream,
+    using only the stdlib decoder. Memory is bounded by the largest single item.
+    Yields nothing if the top-level value is not an array.
+
+    Regression checks (python -m doctest chatgpt_json_to_period_md.py):
+
+    >>> import io
+    >>> list(iter_json_array(io.StringIO('[1, {"a": [2]}, "x"]'), read_size=1))
+    [1, {'a': [2]}, 'x']
+    >>> list(iter_json_array(io.StringIO('[-0.0005, 15000000000.0, 2e-3]'), read_size=4))
+    [-0.0005, 15000000000.0, 0.002]
+    >>> list(iter_json_array(io.StringIO(' [ ] ')))
+    []
+    >>> list(iter_json_array(io.StringIO('{"a": 1}')))
+    []
+    >>> list(iter_json_array(io.StringIO('[1,,2]')))
+    Traceback (most recent call last):
+    ValueError: Expected a JSON array item
+    >>> list(iter_json_array(io.StringIO('[,1]')))
+    Traceback (most recent call last):
+    ValueError: Expected a JSON array item
+    >>> list(iter_json_array(io.StringIO('[1,]')))
+    Traceback (most recent call last):
+    ValueError: Trailing comma in JSON array
+    >>> list(iter_json_array(io.StringIO('[1 2]'), read_size=2))
+    Traceback (most recent call last):
+    ValueError: Expected ',' or ']' after JSON array item
+    >>> list(iter_json_array(io.StringIO('[1,'), read_size=2))
+    Traceback (most recent call last):
+    ValueError: Unexpected end of JSON input
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    # What may come next: "[" (open), an item or "]" (first), an item only
+    # (after a comma), or "," / "]" (after an item)
+    state = "open"
+
+    while True:
+        while pos < len(buf) and buf[pos].isspace():
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("Unexpected end of JSON input")
+            buf = f.read(read_size)
+            pos = 0
+            eof = not buf
+            continue
+
+        c = buf[pos]
+        if state == "open":
+            if c != "[":
+                # Not an array: nothing to yield, matching the other readers
+                return
+            pos += 1
+            state = "first"
+            continue
+
+        if state == "sep":
+            if c == ",":
+                pos += 1
+                state = "item"
+                continue
+            if c == "]":
+                return
+            raise ValueError("Expected ',' or ']' after JSON array item")
+
+        if c == "]":
+            if state == "first":
+                return
+            raise ValueError("Trailing comma in JSON array")
+        if c == ",":
+            raise ValueError("Expected a JSON array item")
+
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = -1
+        if end >= 0:
+            # A number cut at the chunk boundary (e.g. "1." or "2e") still decodes
+            # as a shorter number, so only accept the item once the following
+            # separator is in the buffer.
+            nxt = end
+            while nxt < len(buf) and buf[nxt].isspace():
+                nxt += 1
+            if nxt == len(buf) or buf[nxt] not in ",]":
+                if eof:
+                    raise ValueError("Expected ',' or ']' after JSON array item")
+                end = -1
+        if end < 0:
+            # Item may be truncated at the chunk boundary: read more and retry.
+            # The read size grows with the pending item so retries stay linear.
+            chunk = f.read(max(read_size, len(buf) - pos))
+            buf = buf[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            continue
+        pos = end
+        state = "sep"
+        yield item
+
+def iter_conversations(path: str, stream: bool = True) -> Iterator[Dict[str, Any]]:
     """
     Yield each conversation dict from a top-level JSON array.
 
-    If `ijson` is available, stream items to avoid loading huge files:
+    If `ijson` is available, stream items with it (ijson already picks its
+    fastest installed backend, yajl2_c in regular wheels):
       pip install ijson
+    Otherwise fall back to an incremental stdlib decoder. With stream=False
+    the whole file is loaded at once, with `orjson` if available, else json.load.
     """
+    if not stream:
+        try:
+            import orjson  # type: ignore
+        except Exception:
+            orjson = None  # type: ignore
+        if orjson is not None:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict):
+                    yield item
+        return
+
     try:
         import ijson  # type: ignore
     except Exception:
         ijson = None  # type: ignore
 
     if ijson is not None:
-        with open(path, "rb") as f:
-            for item in ijson.items(f, "item"):
+        # yajl2_c requires a binary stream
+        with open(path, "rb", buffering=READ_BUFFER_SIZE) as f:
+            for item in ijson.items(f, "item", buf_size=IJSON_BUF_SIZE):
                 if isinstance(item, dict):
                     yield item
         return
 
     with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    if isinstance(data, list):
-        for item in data:
+        for item in iter_json_array(f):
             if isinstance(item, dict):
                 yield item
 
@@ -284,33 +530,92 @@ def iter_conversations(path: str) -> Iterator[Dict[str, Any]]:
 # Writing
 # ----------------------------
 
+# Per-file write buffer, several conversations per syscall. Kept moderate because
+# one buffer can be live per open bucket file.
+WRITE_BUFFER_SIZE = 64 * 1024
+# Upper bound on simultaneously open bucket files; past the limit, least recently
+# used ones are closed and reopened in append mode when touched again. High
+# enough that unsorted input rarely reopens anything.
+MAX_OPEN_FILES = 4096
+# File descriptors left for the interpreter, the input file and stdio.
+FD_HEADROOM = 64
+
+def open_file_limit() -> int:
+    """
+    Return how many bucket files may be open at once: MAX_OPEN_FILES, lowered to
+    fit the process's file descriptor limit. Where possible the soft limit is
+    raised toward the hard limit first.
+    """
+    if resource is None:
+        return MAX_OPEN_FILES
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    want = MAX_OPEN_FILES + FD_HEADROOM
+    if soft != resource.RLIM_INFINITY and soft < want:
+        new_soft = want if hard == resource.RLIM_INFINITY else min(want, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+            soft = new_soft
+        except (ValueError, OSError):
+            pass
+    if soft == resource.RLIM_INFINITY:
+        return MAX_OPEN_FILES
+    return max(1, min(MAX_OPEN_FILES, soft - FD_HEADROOM))
+
 def write_bucket_files(
-    chunks: Dict[Tuple[str, str], List[str]],
+    rendered: Iterable[Tuple[str, str, bytes]],
     out_dir: str,
     group_by_month: bool
-) -> None:
+) -> int:
     """
-    chunks key is (bucket_key, month_folder_key).
+    Stream (bucket_key, month_folder_key, utf8_markdown) tuples into bucket files.
     If group_by_month is False, month_folder_key may be ignored.
+    Returns the number of distinct files written.
+
+    Each chunk is appended as soon as it arrives instead of being collected.
+    Memory is one conversation's markdown plus at most one WRITE_BUFFER_SIZE
+    buffer per open file (up to open_file_limit() files).
     """
     ensure_dir(out_dir)
+    max_open = open_file_limit()
 
-    # Determine output paths
-    file_map: Dict[str, List[str]] = {}
-    for (bucket, mon), parts in chunks.items():
-        if group_by_month:
-            out_path = os.path.join(out_dir, mon, f"{bucket}.md")
-        else:
-            out_path = os.path.join(out_dir, f"{bucket}.md")
-        file_map.setdefault(out_path, []).extend(parts)
+    # Bucket and month keys never contain separators, so paths are plain
+    # concatenation onto out_dir (with its trailing separator ensured once).
+    prefix = os.path.join(out_dir, "")
+    sep = os.sep
 
-    for out_path, parts in sorted(file_map.items()):
-        ensure_dir(os.path.dirname(out_path))
-        key_title = os.path.splitext(os.path.basename(out_path))[0]
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(f"# {key_title}\n\n")
-            for p in parts:
-                f.write(p)
+    open_files: "OrderedDict[str, BinaryIO]" = OrderedDict()
+    initialized: Set[str] = set()
+    # Month folders are shared by many bucket files; create each only once.
+    created_months: Set[str] = set()
+    try:
+        for bucket, mon, md in rendered:
+            if group_by_month:
+                out_path = f"{prefix}{mon}{sep}{bucket}.md"
+            else:
+                out_path = f"{prefix}{bucket}.md"
+
+            f = open_files.get(out_path)
+            if f is None:
+                if len(open_files) >= max_open:
+                    open_files.popitem(last=False)[1].close()
+                if out_path in initialized:
+                    f = open(out_path, "ab", buffering=WRITE_BUFFER_SIZE)
+                else:
+                    if group_by_month and mon not in created_months:
+                        ensure_dir(f"{prefix}{mon}")
+                        created_months.add(mon)
+                    f = open(out_path, "wb", buffering=WRITE_BUFFER_SIZE)
+                    f.write(f"# {bucket}\n\n".encode("utf-8"))
+                    initialized.add(out_path)
+                open_files[out_path] = f
+            else:
+                open_files.move_to_end(out_path)
+            f.write(md)
+    finally:
+        for f in open_files.values():
+            f.close()
+    return len(initialized)
 
 
 # ----------------------------
@@ -343,40 +648,24 @@ def main() -> None:
         default="UTC",
         help="Timezone name, e.g. 'UTC' or 'Asia/Tokyo'"
     )
+    ap.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Load the whole input at once (with orjson if installed) instead of streaming it"
+    )
     args = ap.parse_args()
 
     # Timezone handling
-    if args.tz.upper() == "UTC":
-        tz = timezone.utc
-    else:
-        if ZoneInfo is None:
-            raise SystemExit("zoneinfo not available (need Python 3.9+). Use --tz UTC.")
-        try:
-            tz = ZoneInfo(args.tz)
-        except Exception as e:
-            raise SystemExit(
-                f"Could not load timezone '{args.tz}' ({e}). "
-                f"On Windows, install tzdata: python -m pip install tzdata"
-            )
-
-    # Gather chunks by (bucket, month_folder)
-    chunks: Dict[Tuple[str, str], List[str]] = {}
-
-    for convo in iter_conversations(args.input_json):
-        bucket, mon, md = render_conversation_to_md(convo, tz, split=args.split, week_start=args.week_start)
-        chunks.setdefault((bucket, mon), []).append(md)
-
-    write_bucket_files(chunks, args.out_dir, group_by_month=args.group_by_month)
-
-    # Count distinct output files
-    out_files = set()
-    for (bucket, mon) in chunks.keys():
-        if args.group_by_month:
-            out_files.add(os.path.join(args.out_dir, mon, f"{bucket}.md"))
-        else:
-            out_files.add(os.path.join(args.out_dir, f"{bucket}.md"))
+    tz = load_tz(args.tz)
+
+    bucket_fn = make_bucket_fn(args.split, args.week_start)
+    convos = iter_conversations(args.input_json, stream=not args.no_stream)
+    results = (render_conversation_to_md(convo, tz, bucket_fn) for convo in convos)
+
+    # Stream rendered conversations straight into their bucket files
+    n_files = write_bucket_files(results, args.out_dir, group_by_month=args.group_by_month)
 
-    print(f"Done. Wrote {len(out_files)} file(s) to: {args.out_dir}")
+    print(f"Done. Wrote {n_files} file(s) to: {args.out_dir}")
 
 
 if __name__ == "__main__":